@@ -6,9 +6,10 @@ This script demonstrates how to use the analyzer programmatically
 and shows different export options.
 """
 
+import heapq
 import json
 from src.analyzer import RecycleBinAnalyzer
-from src.reporting import display_results, export_to_csv, export_to_json, export_to_html
+from src.reporting import display_results, export_to_csv, export_to_json, export_to_html, export_all
 from src.sid import get_all_user_sids
 import sys
 
@@ -54,6 +55,10 @@ def main():
     print("\n4. Exporting to HTML:")
     export_to_html(files_info, "example_analysis.html")
     
+    # Example 4b: Export all three formats with one call
+    print("\n4b. Exporting all formats:")
+    export_all(files_info, "example_analysis_all")
+    
     # Example 5: Load and process JSON data
     print("\n5. Loading JSON data for processing:")
     try:
@@ -63,16 +68,20 @@ def main():
         print(f"Analysis timestamp: {json_data['analysis_info']['timestamp']}")
         print(f"Total files: {json_data['analysis_info']['total_files']}")
         
-        # Process files programmatically
-        total_size = sum(file_info['file_size'] for file_info in json_data['files'])
+        # Process files programmatically: gather all statistics in a single pass
+        total_size = 0
+        text_files = 0
+        users = set()
+        for file_info in json_data['files']:
+            total_size += file_info['file_size']
+            text_files += file_info['can_read_content']
+            users.add(file_info['sid_folder'])
         print(f"Total size of deleted files: {total_size:,} bytes")
-        
-        # Find text files
-        text_files = [f for f in json_data['files'] if f['can_read_content']]
-        print(f"Text files that can be read: {len(text_files)}")
+        print(f"Text files that can be read: {text_files}")
+        print(f"Users with deleted files: {len(users)}")
         
         # Show largest files
-        largest_files = sorted(json_data['files'], key=lambda x: x['file_size'], reverse=True)[:3]
+        largest_files = heapq.nlargest(3, json_data['files'], key=lambda x: x['file_size'])
         print("\nLargest deleted files:")
         for i, file_info in enumerate(largest_files, 1):
             print(f"  {i}. {file_info['original_name']} ({file_info['file_size']:,} bytes)")
@@ -11,7 +11,7 @@ import argparse
 
 from src.analyzer import RecycleBinAnalyzer
 from src.reporting import display_results, export_to_csv, export_to_json, export_to_html
-from src.sid import get_all_user_sids, get_sid_info, WINDOWS_API_AVAILABLE
+from src.sid import iter_all_user_sids, get_sid_info, WINDOWS_API_AVAILABLE
 
 
 def main():
@@ -32,6 +32,8 @@ def main():
                        help='Export results to HTML file with sortable table')
     parser.add_argument('--show-sids', action='store_true',
                        help='Show all user SIDs found on the system')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Only print a summary instead of scan progress and the per-file listing')
     
     args = parser.parse_args()
     
@@ -47,20 +49,19 @@ def main():
         sys.exit(1)
     
     # Create analyzer and run analysis
-    analyzer = RecycleBinAnalyzer()
+    analyzer = RecycleBinAnalyzer(verbose=not args.quiet)
     
     # Show SIDs if requested
     if args.show_sids:
         print("User SIDs on this system:")
         print("-" * 50)
-        sids = get_all_user_sids()
-        for sid in sids:
+        for sid in iter_all_user_sids():
             sid_info = get_sid_info(sid)
-            if sid_info['username']:
-                if sid_info['description']:
-                    print(f"  {sid_info['username']} ({sid_info['description']})")
+            if sid_info.username:
+                if sid_info.description:
+                    print(f"  {sid_info.username} ({sid_info.description})")
                 else:
-                    print(f"  {sid_info['username']} ({sid})")
+                    print(f"  {sid_info.username} ({sid})")
             else:
                 print(f"  {sid}")
         print()
@@ -70,7 +71,8 @@ def main():
     # Display results
     display_results(files_info, 
                     show_content=args.show_content, 
-                    max_content_length=args.max_content_length)
+                    max_content_length=args.max_content_length,
+                    quiet=args.quiet)
     
     # Export to CSV if requested
     if args.export_csv:
@@ -1,127 +1,209 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict
 
 from src import sid
 from src import parsers
 
+try:
+    import win32api
+except ImportError:
+    win32api = None
+
+# Read buffer size for $I files; typical files (path under ~2000 characters) fit in one read
+_METADATA_BUFFER_SIZE = 4096
+
+def _iter_available_drives() -> Iterator[str]:
+    """Yield the root paths of available drives."""
+    if win32api is not None:
+        # A single call returns a bitmask of present drives (bit 0 = A:)
+        drive_mask = win32api.GetLogicalDrives()
+        for i in range(26):
+            if drive_mask & (1 << i):
+                yield chr(ord('A') + i) + ":\\"
+        return
+    
+    # Fallback: probe drive letters lazily so callers can stop at the first match
+    for drive in range(ord('A'), ord('Z') + 1):
+        drive_letter = chr(drive) + ":\\"
+        if os.path.exists(drive_letter):
+            yield drive_letter
+
+@lru_cache(maxsize=None)
+def get_recycle_bin_path() -> Path:
+    """Get the path to the Windows Recycle Bin (resolved once per process)."""
+    # The Recycle Bin is typically located at C:\$Recycle.Bin on the system drive,
+    # so check that first before looking at other drives
+    system_drive = os.environ.get('SystemDrive', 'C:') + "\\"
+    recycle_bin = Path(system_drive) / "$Recycle.Bin"
+    if recycle_bin.exists():
+        return recycle_bin
+    
+    # Look for $Recycle.Bin in each drive
+    for drive in _iter_available_drives():
+        if drive.upper() == system_drive.upper():
+            continue
+        recycle_bin = Path(drive) / "$Recycle.Bin"
+        if recycle_bin.exists():
+            return recycle_bin
+            
+    # Fallback to C: drive
+    return Path("C:\\$Recycle.Bin")
+
 class RecycleBinAnalyzer:
     """Analyzes the Windows Recycle Bin and provides detailed information about deleted files."""
     
-    def __init__(self):
-        self.recycle_bin_path = self._get_recycle_bin_path()
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose  # Print scan progress messages
+        self.recycle_bin_path = get_recycle_bin_path()
         self.files_info: List[Dict] = []
         self.current_user_sid = sid.get_current_user_sid()
         self.sid_cache = {}  # Cache for SID to username resolution
         
-    def _get_recycle_bin_path(self) -> Path:
-        """Get the path to the Windows Recycle Bin."""
-        # The Recycle Bin is typically located at C:\$Recycle.Bin
-        # But it might be on different drives
-        drives = []
-        
-        # Get all available drives
-        for drive in range(ord('A'), ord('Z') + 1):
-            drive_letter = chr(drive) + ":\\"
-            if os.path.exists(drive_letter):
-                drives.append(drive_letter)
-        
-        # Look for $Recycle.Bin in each drive
-        for drive in drives:
-            recycle_bin = Path(drive) / "$Recycle.Bin"
-            if recycle_bin.exists():
-                return recycle_bin
-                
-        # Fallback to C: drive
-        return Path("C:\\$Recycle.Bin")
-    
     def _get_sid_display_name(self, sid_string: str) -> str:
         """Get a user-friendly display name for a SID."""
         if sid_string not in self.sid_cache:
             sid_info = sid.get_sid_info(sid_string)
-            if sid_info['username']:
-                if sid_info['description']:
-                    self.sid_cache[sid_string] = f"{sid_info['username']} ({sid_info['description']})"
+            if sid_info.username:
+                if sid_info.description:
+                    self.sid_cache[sid_string] = f"{sid_info.username} ({sid_info.description})"
                 else:
-                    self.sid_cache[sid_string] = f"{sid_info['username']} ({sid_string})"
+                    self.sid_cache[sid_string] = f"{sid_info.username} ({sid_string})"
             else:
                 self.sid_cache[sid_string] = sid_string
         return self.sid_cache[sid_string]
     
     def analyze(self) -> List[Dict]:
         """Perform the complete Recycle Bin analysis."""
-        print("Starting Windows Recycle Bin analysis...")
-        self.files_info = self._scan_recycle_bin()
+        if self.verbose:
+            print("Starting Windows Recycle Bin analysis...")
+        self.files_info = list(self._scan_recycle_bin())
         return self.files_info
     
-    def _scan_recycle_bin(self) -> List[Dict]:
-        """Scan the Recycle Bin directory for deleted files."""
-        files_info: List[Dict] = []
+    def analyze_statistics(self) -> Dict:
+        """Scan the Recycle Bin and compute summary statistics in a single pass without keeping the records."""
+        if self.verbose:
+            print("Starting Windows Recycle Bin analysis...")
+        total_files = 0
+        total_size = 0
+        readable_files = 0
+        sid_folders = set()
+        
+        for file_info in self._scan_recycle_bin():
+            total_files += 1
+            total_size += file_info.get('file_size', 0)
+            if file_info.get('can_read_content'):
+                readable_files += 1
+            # INFO2 records have no SID folder and must not count as a user
+            sid_folder = file_info.get('sid_folder')
+            if sid_folder:
+                sid_folders.add(sid_folder)
         
+        return {
+            'total_files': total_files,
+            'total_size': total_size,
+            'readable_files': readable_files,
+            'unique_sids': len(sid_folders)
+        }
+    
+    def _scan_recycle_bin(self) -> Iterator[Dict]:
+        """Scan the Recycle Bin directory and yield deleted files as they are parsed."""
         if not self.recycle_bin_path.exists():
             print(f"Recycle Bin not found at: {self.recycle_bin_path}")
-            return files_info
+            return
         
-        print(f"Scanning Recycle Bin at: {self.recycle_bin_path}")
+        if self.verbose:
+            print(f"Scanning Recycle Bin at: {self.recycle_bin_path}")
         
         # Look for INFO2 file (older Windows versions)
         info2_path = self.recycle_bin_path / "INFO2"
         if info2_path.exists():
-            print("Found INFO2 file (older Windows format)")
-            files_info.extend(parsers.parse_info2_file(info2_path))
+            if self.verbose:
+                print("Found INFO2 file (older Windows format)")
+            yield from parsers.parse_info2_file(info2_path)
         
         # Scan SID folders (newer Windows versions)
-        print("Scanning SID-based folders...")
-        if self.current_user_sid:
-            current_user_display = self._get_sid_display_name(self.current_user_sid)
-            print(f"Current user: {current_user_display}")
+        if self.verbose:
+            print("Scanning SID-based folders...")
+            if self.current_user_sid:
+                current_user_display = self._get_sid_display_name(self.current_user_sid)
+                print(f"Current user: {current_user_display}")
         
-        # Get all SID folders
+        # Get all SID folders, setting the current user's folder aside in the same pass.
+        # os.scandir returns the entry type with the listing, avoiding a stat per entry
+        current_user_folder = None
         sid_folders = []
-        for item in self.recycle_bin_path.iterdir():
-            if item.is_dir() and item.name.startswith('S-'):
-                sid_folders.append(item)
+        with os.scandir(self.recycle_bin_path) as entries:
+            for entry in entries:
+                if entry.name[:2] == 'S-' and entry.is_dir(follow_symlinks=False):
+                    if entry.name == self.current_user_sid:
+                        current_user_folder = Path(entry.path)
+                    else:
+                        sid_folders.append(Path(entry.path))
         
-        print(f"Found {len(sid_folders)} SID folders")
+        if self.verbose:
+            print(f"Found {len(sid_folders) + (current_user_folder is not None)} SID folders")
         
-        # Prioritize current user's folder, then scan others
-        if self.current_user_sid:
-            current_user_folder = self.recycle_bin_path / self.current_user_sid
-            if current_user_folder.exists():
-                current_user_display = self._get_sid_display_name(self.current_user_sid)
-                print(f"Scanning current user folder: {current_user_display}")
-                self._scan_sid_folder(current_user_folder, files_info)
+        # Resolve all folder SIDs in one concurrent batch up front so the display
+        # names below come from the lookup cache instead of one RPC at a time
+        sid.resolve_sids_bulk(sid_folder.name for sid_folder in sid_folders)
         
-        # Scan other SID folders
+        # Prioritize current user's folder, then scan others
+        scan_targets = []
+        if current_user_folder is not None:
+            scan_targets.append((current_user_folder, self._get_sid_display_name(self.current_user_sid)))
         for sid_folder in sid_folders:
-            if not self.current_user_sid or sid_folder.name != self.current_user_sid:
-                sid_display = self._get_sid_display_name(sid_folder.name)
-                print(f"Scanning SID folder: {sid_display}")
-                self._scan_sid_folder(sid_folder, files_info)
+            scan_targets.append((sid_folder, self._get_sid_display_name(sid_folder.name)))
         
-        return files_info
+        # Folders are independent and the work is I/O-bound, so scan them concurrently;
+        # map() keeps the results in submission order (current user first)
+        if scan_targets:
+            max_workers = min(32, len(scan_targets) * 4)
+            found_files = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                sid_paths, sid_displays = zip(*scan_targets)
+                for folder_files in executor.map(self._scan_sid_folder, sid_paths, sid_displays):
+                    found_files += len(folder_files)
+                    yield from folder_files
+            
+            # One summary line instead of a console write per folder
+            if self.verbose:
+                print(f"Scanned {len(scan_targets)} SID folders, found {found_files} deleted files")
     
-    def _scan_sid_folder(self, sid_path: Path, files_info: List[Dict]):
-        """Scan a specific user's Recycle Bin folder."""
+    def _scan_sid_folder(self, sid_path: Path, sid_display: str) -> List[Dict]:
+        """Scan a specific user's Recycle Bin folder and return its deleted files."""
+        files_info: List[Dict] = []
         try:
-            # Look for $I files (metadata files)
-            i_files = [f for f in sid_path.iterdir() if f.is_file() and f.name.startswith('$I')]
+            # Look for $I files (metadata files) and, in the same listing, their
+            # $R counterparts so pairing needs no extra existence checks
+            i_files = []
+            r_entries = {}  # $R name -> is a regular file (deleted folders are $R directories)
+            with os.scandir(sid_path) as entries:
+                for entry in entries:
+                    prefix = entry.name[:2]
+                    if prefix == '$I':
+                        if entry.is_file(follow_symlinks=False):
+                            i_files.append(entry.path)
+                    elif prefix == '$R':
+                        r_entries[entry.name] = entry.is_file(follow_symlinks=False)
             
             if not i_files:
-                sid_display = self._get_sid_display_name(sid_path.name)
-                print(f"  No deleted files found in {sid_display}")
-                return
-            
-            sid_display = self._get_sid_display_name(sid_path.name)
-            print(f"  Found {len(i_files)} deleted files in {sid_display}")
+                return files_info
             
+            # One read buffer per folder task, reused for every $I file in it
+            buffer = bytearray(_METADATA_BUFFER_SIZE)
+            sid_name = sid_path.name
             for i_file in i_files:
                 # Parse the metadata file
-                file_info = parsers.parse_metadata_file(i_file)
+                file_info = parsers.parse_metadata_file(i_file, r_entries, buffer)
                 if file_info:
-                    file_info['sid_folder'] = sid_path.name
+                    file_info['sid_folder'] = sid_name
                     file_info['sid_display'] = sid_display
                     files_info.append(file_info)
                     
         except Exception as e:
-            print(f"Error scanning SID folder {sid_path}: {e}") 
\ No newline at end of file
+            print(f"Error scanning SID folder {sid_path}: {e}")
+        
+        return files_info
@@ -1,149 +1,158 @@
+import codecs
+import ntpath
+import os
 import struct
 import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
+
+# FILETIME ticks (100 ns) per second, and seconds between 1601-01-01 and the Unix epoch
+_FILETIME_TICKS_PER_SECOND = 10000000
+_FILETIME_UNIX_EPOCH_OFFSET = 11644473600
+
+# INFO2 layout: 20-byte header followed by fixed-size records that start with file size and deletion time
+_INFO2_HEADER_SIZE = 20
+_INFO2_RECORD_SIZE = 280  # Standard record size
+_INFO2_HEADER = struct.Struct('<II')  # version, file count
+_INFO2_RECORD = struct.Struct('<QQ')
+
+# $I header signature (format version 2) followed by size, deletion time and path length
+_METADATA_SIGNATURE = b'\x02\x00\x00\x00\x00\x00\x00\x00'
+_METADATA_HEADER = struct.Struct('<QQI')
+# How far into a $I file to look for the signature (skips leading junk such as a BOM)
+_METADATA_SEARCH_LIMIT = 100
 
 def _filetime_to_datetime(filetime: int) -> Optional[datetime.datetime]:
     """Convert Windows FILETIME to datetime with proper timezone handling."""
     if filetime <= 0:
         return None
     
-    # Windows FILETIME is in 100-nanosecond intervals since 1601-01-01 UTC
-    # Convert to seconds since 1601-01-01
-    seconds_since_1601 = filetime // 10000000
-    
-    # Convert to seconds since Unix epoch (1970-01-01)
-    # Unix epoch is 11644473600 seconds after Windows epoch
-    seconds_since_1970 = seconds_since_1601 - 11644473600
-    
-    # Create datetime in local timezone directly
-    # Use fromtimestamp instead of utcfromtimestamp to get local time
-    local_datetime = datetime.datetime.fromtimestamp(seconds_since_1970)
-    
-    return local_datetime
+    # Windows FILETIME is in 100-nanosecond intervals since 1601-01-01 UTC.
+    # Shift to the Unix epoch and let fromtimestamp build a local-time datetime
+    # in one C call (no per-record epoch or timedelta objects).
+    return datetime.datetime.fromtimestamp(filetime // _FILETIME_TICKS_PER_SECOND - _FILETIME_UNIX_EPOCH_OFFSET)
 
 def parse_info2_file(info2_path: Path) -> List[Dict]:
     """Parse the INFO2 file to get metadata about deleted files (older Windows versions)."""
     files_info = []
     
     try:
+        # Read the whole file once and walk the fixed-size records in memory;
+        # the memoryview lets names be decoded without copying each record
         with open(info2_path, 'rb') as f:
-            # Read the header
-            header = f.read(20)
-            if len(header) < 20:
-                return files_info
+            data = f.read()
+        view = memoryview(data)
+        
+        # Read the header
+        if len(data) < _INFO2_HEADER_SIZE:
+            return files_info
+        
+        # Parse header information
+        version, file_count = _INFO2_HEADER.unpack_from(data, 0)
+        
+        # Read file records
+        for index in range(file_count):
+            offset = _INFO2_HEADER_SIZE + index * _INFO2_RECORD_SIZE
+            if offset + _INFO2_RECORD_SIZE > len(data):
+                break
+            
+            # Parse record fields
+            file_size, delete_time = _INFO2_RECORD.unpack_from(data, offset)
+            
+            # Extract file name (UTF-16, null-terminated). Search for the
+            # terminator after decoding: a byte-level search for b'\x00'
+            # matches the high byte of every ASCII character.
+            original_name = codecs.utf_16_le_decode(view[offset + 16:offset + _INFO2_RECORD_SIZE], 'ignore', True)[0]
+            name_end = original_name.find('\x00')
+            if name_end != -1:
+                original_name = original_name[:name_end]
+            
+            # Convert Windows file time to datetime
+            delete_datetime = _filetime_to_datetime(delete_time)
             
-            # Parse header information
-            version, file_count = struct.unpack('<II', header[:8])
+            files_info.append({
+                'original_name': original_name,
+                'file_size': file_size,
+                'delete_time': delete_datetime
+            })
             
-            # Read file records
-            for _ in range(file_count):
-                record = f.read(280)  # Standard record size
-                if len(record) < 280:
-                    break
-                
-                # Parse record fields
-                file_size = struct.unpack('<Q', record[0:8])[0]
-                delete_time = struct.unpack('<Q', record[8:16])[0]
-                
-                # Extract file name (null-terminated)
-                name_bytes = record[16:280]
-                name_end = name_bytes.find(b'\x00')
-                if name_end != -1:
-                    original_name = name_bytes[:name_end].decode('utf-16le', errors='ignore')
-                else:
-                    original_name = name_bytes.decode('utf-16le', errors='ignore')
-                
-                # Convert Windows file time to datetime
-                delete_datetime = _filetime_to_datetime(delete_time)
-                
-                files_info.append({
-                    'original_name': original_name,
-                    'file_size': file_size,
-                    'delete_time': delete_datetime,
-                    'record_data': record
-                })
-                
     except Exception as e:
         print(f"Error parsing INFO2 file: {e}")
         
     return files_info
 
-def parse_metadata_file(metadata_path: Path) -> Optional[Dict]:
+def parse_metadata_file(metadata_path: Union[str, Path], r_entries: Optional[Dict[str, bool]] = None,
+                        buffer: Optional[bytearray] = None) -> Optional[Dict]:
     """Parse a $I metadata file according to the documented format."""
     try:
+        # $I files are tiny, so read the whole file at once and decode in memory.
+        # A caller scanning many files can pass a reusable buffer to read into.
         with open(metadata_path, 'rb') as f:
-            # Skip any junk bytes (FF FE) before header
-            while True:
-                pos = f.tell()
-                header = f.read(8)
-                if len(header) < 8:
-                    return None
-                
-                # Check if this is the correct header (02 00 00 00 00 00 00 00)
-                if header == b'\x02\x00\x00\x00\x00\x00\x00\x00':
-                    break
-                elif header.startswith(b'\xff\xfe'):
-                    # Skip BOM and continue
-                    continue
-                else:
-                    # Try next byte
-                    f.seek(pos + 1)
-                    if f.tell() > pos + 100:  # Limit search
-                        return None
-            
-            # Read file size (8 bytes, little endian)
-            size_data = f.read(8)
-            if len(size_data) < 8:
-                return None
-            file_size = struct.unpack('<Q', size_data)[0]
-            
-            # Read deletion date (8 bytes, FILETIME format)
-            time_data = f.read(8)
-            if len(time_data) < 8:
-                return None
-            delete_time = struct.unpack('<Q', time_data)[0]
-            
-            # Convert FILETIME to datetime
-            delete_datetime = _filetime_to_datetime(delete_time)
-            
-            # Read path length (4 bytes, little endian)
-            path_len_data = f.read(4)
-            if len(path_len_data) < 4:
-                return None
-            path_len = struct.unpack('<I', path_len_data)[0]
-            
-            # Read original path (UTF-16, null-terminated)
-            if path_len > 0:
-                path_data = f.read(path_len * 2)  # UTF-16 = 2 bytes per character
-                if len(path_data) >= path_len * 2:
-                    # Remove null terminator if present
-                    if path_data.endswith(b'\x00\x00'):
-                        path_data = path_data[:-2]
-                    original_path = path_data.decode('utf-16le', errors='ignore')
-                    original_name = Path(original_path).name
-                else:
-                    original_path = "Unknown"
-                    original_name = "Unknown"
+            if buffer is None:
+                data = f.read()
+                size = len(data)
             else:
-                original_path = "Unknown"
-                original_name = "Unknown"
-            
-            # Look for corresponding $R file (the actual deleted file)
-            r_filename = metadata_path.name.replace('$I', '$R')
-            r_file_path = metadata_path.parent / r_filename
-            
-            return {
-                'original_name': original_name,
-                'original_path': original_path,
-                'file_size': file_size,
-                'delete_time': delete_datetime,
-                'recycled_name': metadata_path.name,
-                'actual_file_path': r_file_path if r_file_path.exists() else None,
-                'can_read_content': r_file_path.exists() and r_file_path.is_file(),
-                'metadata_file': metadata_path
-            }
+                data = buffer
+                size = f.readinto(buffer)
+                if size == len(buffer):
+                    # Longer than the buffer (very long path): read the rest as well
+                    data = bytes(buffer) + f.read()
+                    size = len(data)
+        
+        # Skip any junk bytes (FF FE) before header
+        offset = data.find(_METADATA_SIGNATURE, 0, min(size, _METADATA_SEARCH_LIMIT + len(_METADATA_SIGNATURE)))
+        if offset == -1:
+            return None
+        offset += len(_METADATA_SIGNATURE)
+        
+        # File size, deletion date (FILETIME) and path length in a single unpack
+        if size < offset + _METADATA_HEADER.size:
+            return None
+        file_size, delete_time, path_len = _METADATA_HEADER.unpack_from(data, offset)
+        offset += _METADATA_HEADER.size
+        
+        # Convert FILETIME to datetime
+        delete_datetime = _filetime_to_datetime(delete_time)
+        
+        # Read original path (UTF-16, null-terminated)
+        path_end = offset + path_len * 2  # UTF-16 = 2 bytes per character
+        if path_len > 0 and size >= path_end:
+            # Decode straight from the read buffer, then drop the null terminator;
+            # checking after decoding keeps the test aligned to UTF-16 code units
+            original_path = codecs.utf_16_le_decode(memoryview(data)[offset:path_end], 'ignore', True)[0]
+            if original_path.endswith('\x00'):
+                original_path = original_path[:-1]
+            # Original paths are always Windows paths; ntpath splits them without building a Path
+            original_name = ntpath.basename(original_path)
+        else:
+            original_path = "Unknown"
+            original_name = "Unknown"
+        
+        # Look for corresponding $R file (the actual deleted file). Work on plain
+        # strings here and only build Path objects for the returned record.
+        recycled_name = os.path.basename(metadata_path)
+        r_filename = '$R' + recycled_name[2:]
+        r_file_path = os.path.join(os.path.dirname(metadata_path), r_filename)
+        # r_entries maps the $R names already listed by the caller to whether each
+        # is a regular file; without it, fall back to probing the filesystem
+        if r_entries is None:
+            r_exists = os.path.exists(r_file_path)
+            r_is_file = r_exists and os.path.isfile(r_file_path)
+        else:
+            r_is_file = r_entries.get(r_filename)
+            r_exists = r_is_file is not None
+        
+        return {
+            'original_name': original_name,
+            'original_path': original_path,
+            'file_size': file_size,
+            'delete_time': delete_datetime,
+            'recycled_name': recycled_name,
+            'actual_file_path': Path(r_file_path) if r_exists else None,
+            'can_read_content': bool(r_is_file),
+            'metadata_file': Path(metadata_path)
+        }
             
     except Exception as e:
         print(f"Error parsing metadata file {metadata_path}: {e}")
-        return None 
\ No newline at end of file
+        return None
@@ -1,177 +1,241 @@
+import os
+import string
+import sys
 from pathlib import Path
-from typing import List, Dict
-import csv
+from typing import Iterator, List, Dict, Union
+import gzip
+import html
 import json
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 
-def display_results(files_info: List[Dict], show_content: bool = False, max_content_length: int = 1000):
-    """Display the analysis results."""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Record fields used by the exporters, with the value used when a record lacks one
+# (INFO2 records, for example, carry no path or SID information)
+_EXPORT_DEFAULTS = {
+    'original_name': '',
+    'original_path': '',
+    'file_size': 0,
+    'delete_time': '',
+    'sid_folder': '',
+    'sid_display': '',
+    'recycled_name': '',
+    'can_read_content': False
+}
+_get_export_fields = itemgetter(*_EXPORT_DEFAULTS)
+
+def _export_fields(file_info: Dict) -> tuple:
+    """Pull the export columns out of a record, filling defaults only if a field is missing."""
+    # Records from the $I parser have every field, so the common case needs no dict copy
+    try:
+        return _get_export_fields(file_info)
+    except KeyError:
+        return _get_export_fields({**_EXPORT_DEFAULTS, **file_info})
+
+# Characters of file content shown in a console preview
+_PREVIEW_CHARS = 200
+
+# Compact JSON separators (no padding spaces inside records)
+_JSON_SEPARATORS = (',', ':')
+
+# Extensions whose content can be previewed as text
+_TEXT_EXTENSIONS = frozenset({'.txt', '.log', '.csv', '.json', '.xml', '.html', '.htm', '.css', '.js', '.py', '.java', '.cpp', '.c', '.h', '.md', '.rst'})
+
+@contextmanager
+def _atomic_open(output_file: str, mode: str = 'w', **kwargs):
+    """Write to a temporary sibling file (gzip-compressed for *.gz names) and move it into place on success."""
+    output_file = os.fspath(output_file)
+    temp_file = output_file + '.tmp'
+    try:
+        if output_file.lower().endswith('.gz'):
+            # Compress on the fly; gzip keeps its own buffer, so drop the buffering hint
+            kwargs.pop('buffering', None)
+            f = gzip.open(temp_file, mode + 't', compresslevel=6, **kwargs)
+        else:
+            f = open(temp_file, mode, **kwargs)
+        with f:
+            yield f
+        os.replace(temp_file, output_file)
+    except BaseException:
+        # Leave any previous export in place instead of a truncated file
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+def display_results(files_info: List[Dict], show_content: bool = False, max_content_length: int = 1000,
+                    quiet: bool = False):
+    """Display the analysis results (only a summary line when quiet)."""
     if not files_info:
         print("No deleted files found in the Recycle Bin.")
         return
     
+    # Skip formatting the per-file listing entirely when nobody will read it
+    if quiet:
+        print(f"\nFound {len(files_info)} deleted files.")
+        return
+    
     print(f"\nFound {len(files_info)} deleted files:")
     print("=" * 80)
     
+    # Collect all output lines and write them at once instead of one print() per line
+    lines = []
+    append = lines.append
     for i, file_info in enumerate(files_info, 1):
-        print(f"\n{i}. File Information:")
-        print(f"   Original Name: {file_info.get('original_name', 'Unknown')}")
-        print(f"   Original Location: {file_info.get('original_path', 'Unknown')}")
-        print(f"   File Size: {file_info.get('file_size', 0):,} bytes")
+        append(f"\n{i}. File Information:")
+        append(f"   Original Name: {file_info.get('original_name', 'Unknown')}")
+        append(f"   Original Location: {file_info.get('original_path', 'Unknown')}")
+        append(f"   File Size: {file_info.get('file_size', 0):,} bytes")
         
         # Format delete time properly
         delete_time_obj = file_info.get('delete_time', 'Unknown')
         if delete_time_obj and hasattr(delete_time_obj, 'strftime'):
-            delete_time_str = delete_time_obj.strftime("%Y-%m-%d %H:%M:%S")
+            delete_time_str = _format_datetime(delete_time_obj)
         else:
             delete_time_str = str(delete_time_obj)
-        print(f"   Delete Time: {delete_time_str}")
+        append(f"   Delete Time: {delete_time_str}")
         
         # Display user-friendly SID information
         sid_display = file_info.get('sid_display', file_info.get('sid_folder', 'Unknown'))
-        print(f"   User: {sid_display}")
+        append(f"   User: {sid_display}")
         
-        print(f"   Recycled Name: {file_info.get('recycled_name', 'Unknown')}")
-        print(f"   Can Read Content: {file_info.get('can_read_content', False)}")
+        append(f"   Recycled Name: {file_info.get('recycled_name', 'Unknown')}")
+        append(f"   Can Read Content: {file_info.get('can_read_content', False)}")
         
         if show_content and file_info.get('can_read_content') and file_info.get('actual_file_path'):
-            _display_file_content(file_info['actual_file_path'], max_content_length)
+            lines.extend(_format_file_content(file_info['actual_file_path'], max_content_length))
         
-        print("-" * 40)
+        append("-" * 40)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def _display_file_content(file_path: Path, max_length: int):
-    """Display file content if it's a text file."""
+def _format_file_content(file_path: Union[str, Path], max_length: int) -> List[str]:
+    """Format a content preview of a file if it's a text file."""
     try:
-        # Check if it's likely a text file
-        text_extensions = {'.txt', '.log', '.csv', '.json', '.xml', '.html', '.htm', '.css', '.js', '.py', '.java', '.cpp', '.c', '.h', '.md', '.rst'}
-        
-        if file_path.suffix.lower() in text_extensions:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(max_length)
-                print(f"   Content Preview ({len(content)} chars):")
-                print(f"   {repr(content[:200])}...")
-                if len(content) > 200:
-                    print(f"   ... (truncated, max {max_length} chars)")
-        else:
-            print(f"   Content: Binary file (extension: {file_path.suffix})")
+        # Only likely text files are opened; anything else is reported without I/O
+        extension = os.path.splitext(file_path)[1]
+        if extension.lower() in _TEXT_EXTENSIONS:
+            # Only the first _PREVIEW_CHARS characters are ever shown, so read just
+            # enough bytes for one more than that (UTF-8 uses at most 4 bytes per
+            # character) to tell whether the preview is truncated
+            shown = max(0, min(max_length, _PREVIEW_CHARS))
+            with open(file_path, 'rb', buffering=0) as f:
+                raw = f.read((shown + 1) * 4)
+            # An empty read means an empty file; no separate stat call is needed
+            if not raw:
+                return ["   Content: Empty file"]
+            text = raw.decode('utf-8', errors='ignore')
+            content = text[:shown]
+            lines = [
+                f"   Content Preview ({len(content)} chars):",
+                f"   {repr(content)}..."
+            ]
+            if len(text) > shown:
+                lines.append(f"   ... (truncated, max {max_length} chars)")
+            return lines
+        return [f"   Content: Binary file (extension: {extension})"]
             
     except Exception as e:
-        print(f"   Content: Error reading file - {e}")
+        return [f"   Content: Error reading file - {e}"]
+
+@lru_cache(maxsize=4096)
+def _format_datetime(datetime_obj: datetime) -> str:
+    """Format a datetime once per distinct value (bulk deletes share timestamps)."""
+    return datetime_obj.strftime("%Y-%m-%d %H:%M:%S")
+
+def _format_delete_time(delete_time_obj) -> str:
+    """Format a delete time for export."""
+    if delete_time_obj and hasattr(delete_time_obj, 'strftime'):
+        return _format_datetime(delete_time_obj)
+    return str(delete_time_obj) if delete_time_obj else ''
+
+def _csv_rows(files_info: List[Dict]):
+    """Yield CSV rows in the order of the CSV header."""
+    for file_info in files_info:
+        row = _export_fields(file_info)
+        yield row[:3] + (_format_delete_time(row[3]),) + row[4:]
 
 def export_to_csv(files_info: List[Dict], output_file: str = "recycle_bin_analysis.csv"):
     """Export the analysis results to a CSV file."""
+    # Imported here so runs that never write CSV don't load the module
+    import csv
+    
     try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        # Large write buffer so rows are flushed in big chunks rather than per row
+        with _atomic_open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
             fieldnames = ['original_name', 'original_path', 'file_size', 'delete_time', 'sid_folder', 'username', 'recycled_name', 'can_read_content']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
-            for file_info in files_info:
-                # Prepare row data
-                # Format delete time properly
-                delete_time_obj = file_info.get('delete_time', '')
-                if delete_time_obj and hasattr(delete_time_obj, 'strftime'):
-                    delete_time_str = delete_time_obj.strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    delete_time_str = str(delete_time_obj) if delete_time_obj else ''
-                
-                row = {
-                    'original_name': file_info.get('original_name', ''),
-                    'original_path': file_info.get('original_path', ''),
-                    'file_size': file_info.get('file_size', 0),
-                    'delete_time': delete_time_str,
-                    'sid_folder': file_info.get('sid_folder', ''),
-                    'username': file_info.get('sid_display', ''),
-                    'recycled_name': file_info.get('recycled_name', ''),
-                    'can_read_content': file_info.get('can_read_content', False)
-                }
-                writer.writerow(row)
+            writer.writerow(fieldnames)
+            writer.writerows(_csv_rows(files_info))
         
         print(f"\nAnalysis exported to: {output_file}")
         
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
 
+def _dump_json(value) -> str:
+    """Serialize a value as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, separators=_JSON_SEPARATORS, ensure_ascii=False)
+
+def _json_record(file_info: Dict) -> Dict:
+    """Convert a record to its JSON-serializable export form."""
+    (original_name, original_path, file_size, delete_time, sid_folder,
+     sid_display, recycled_name, can_read_content) = _export_fields(file_info)
+    # Skip str() for paths that are already strings
+    actual_file_path = file_info.get('actual_file_path')
+    return {
+        'original_name': original_name,
+        'original_path': original_path if isinstance(original_path, str) else str(original_path),
+        'file_size': file_size,
+        'delete_time': _format_delete_time(delete_time),
+        'sid_folder': sid_folder,
+        'username': sid_display,
+        'recycled_name': recycled_name,
+        'can_read_content': can_read_content,
+        'actual_file_path': str(actual_file_path) if actual_file_path else None
+    }
+
 def export_to_json(files_info: List[Dict], output_file: str = "recycle_bin_analysis.json"):
     """Export the analysis results to a JSON file."""
     try:
-        # Prepare data for JSON export
-        json_data = {
-            'analysis_info': {
-                'timestamp': datetime.now().isoformat(),
-                'total_files': len(files_info),
-                'export_format': 'json'
-            },
-            'files': []
+        analysis_info = {
+            'timestamp': datetime.now().isoformat(),
+            'total_files': len(files_info),
+            'export_format': 'json'
         }
         
-        for file_info in files_info:
-            # Convert file_info to JSON-serializable format
-            # Format delete time properly
-            delete_time_obj = file_info.get('delete_time', '')
-            if delete_time_obj and hasattr(delete_time_obj, 'strftime'):
-                delete_time_str = delete_time_obj.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                delete_time_str = str(delete_time_obj) if delete_time_obj else ''
-            
-            json_file_info = {
-                'original_name': file_info.get('original_name', ''),
-                'original_path': str(file_info.get('original_path', '')),
-                'file_size': file_info.get('file_size', 0),
-                'delete_time': delete_time_str,
-                'sid_folder': file_info.get('sid_folder', ''),
-                'username': file_info.get('sid_display', ''),
-                'recycled_name': file_info.get('recycled_name', ''),
-                'can_read_content': file_info.get('can_read_content', False),
-                'actual_file_path': str(file_info.get('actual_file_path', '')) if file_info.get('actual_file_path') else None
-            }
-            json_data['files'].append(json_file_info)
-        
-        # Write to JSON file with proper formatting
-        with open(output_file, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
+        # Stream the document: header, then one record per line, so the converted
+        # records are never all held in memory. The large buffer absorbs the many
+        # small writes this makes.
+        with _atomic_open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as jsonfile:
+            jsonfile.write('{\n  "analysis_info": ')
+            jsonfile.write(_dump_json(analysis_info))
+            jsonfile.write(',\n  "files": [')
+            separator = '\n    '
+            for file_info in files_info:
+                jsonfile.write(separator)
+                jsonfile.write(_dump_json(_json_record(file_info)))
+                separator = ',\n    '
+            jsonfile.write('\n  ]\n}\n')
         
         print(f"\nAnalysis exported to JSON: {output_file}")
         
     except Exception as e:
         print(f"Error exporting to JSON: {e}")
 
-def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analysis.html"):
-    """Export the analysis results to an HTML file with sortable table."""
-    try:
-        # Calculate file extension statistics
-        extension_stats = {}
-        total_files = len(files_info)
-        
-        for file_info in files_info:
-            original_name = file_info.get('original_name', '')
-            if original_name:
-                # Extract file extension
-                if '.' in original_name:
-                    extension = original_name.split('.')[-1].lower()
-                    if extension:
-                        extension_stats[extension] = extension_stats.get(extension, 0) + 1
-                else:
-                    # Files without extension
-                    extension_stats['No Extension'] = extension_stats.get('No Extension', 0) + 1
-            else:
-                # Unknown files
-                extension_stats['Unknown'] = extension_stats.get('Unknown', 0) + 1
-        
-        # Sort extensions by count (descending) and limit to top 10
-        sorted_extensions = sorted(extension_stats.items(), key=lambda x: x[1], reverse=True)
-        top_extensions = sorted_extensions[:10]
-        
-        # Prepare chart data
-        chart_labels = [ext for ext, count in top_extensions]
-        chart_data = [count for ext, count in top_extensions]
-        chart_colors = [
-            '#475569', '#64748b', '#94a3b8', '#cbd5e1', '#e2e8f0',
-            '#334155', '#1e293b', '#f1f5f9', '#94a3b8', '#64748b'
-        ]
-        
-        # HTML template with embedded CSS and JavaScript
-        html_template = """<!DOCTYPE html>
+# HTML report template with embedded CSS and JavaScript (str.format syntax)
+_HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -548,6 +612,10 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
             font-size: 1.1rem;
         }}
         
+        .filter-hidden {{
+            display: none;
+        }}
+        
         .extension-list {{
             margin-top: 15px;
             font-size: 0.9em;
@@ -698,22 +766,32 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
 
     <script>
         let currentSort = {{ column: -1, direction: 'asc' }};
-        let originalData = [];
         let filteredData = [];
+        let rowCache = [];
+        let filterTimer = null;
+
+        // Shortest search text that filters the table
+        const SEARCH_MIN_LENGTH = 2;
 
         // Initialize the table
         document.addEventListener('DOMContentLoaded', function() {{
-            // Store original data for filtering
+            // Cache the rows for filtering and sorting
             const tbody = document.querySelector('#dataTable tbody');
             const rows = tbody.querySelectorAll('tr');
-            originalData = Array.from(rows).map(row => row.innerHTML);
-            filteredData = [...originalData];
+            filteredData = Array.from(rows);
+            // Lowercased row text is computed once so searching never reads the DOM
+            rowCache = Array.from(rows, row => ({{ row: row, text: row.textContent.toLowerCase(), hidden: false }}));
             
-            // Add search functionality
-            document.getElementById('searchBox').addEventListener('input', filterTable);
+            // Add search functionality (debounced so fast typing filters once)
+            document.getElementById('searchBox').addEventListener('input', scheduleFilter);
             
-            // Initialize chart
-            initializeChart();
+            // Build the chart once the browser is idle so the table and search box
+            // are interactive first
+            if (window.requestIdleCallback) {{
+                window.requestIdleCallback(initializeChart, {{ timeout: 1000 }});
+            }} else {{
+                setTimeout(initializeChart, 0);
+            }}
             
             // Add keyboard shortcuts
             document.addEventListener('keydown', function(e) {{
@@ -783,10 +861,30 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
             }});
         }}
 
+        function sortKey(entry, columnIndex) {{
+            // Each cell is read and converted once per column, then reused by later sorts
+            if (!entry.keys) {{
+                entry.keys = [];
+            }}
+            let key = entry.keys[columnIndex];
+            if (key === undefined) {{
+                const cell = entry.row.children[columnIndex];
+                const text = cell ? cell.textContent.trim() : '';
+                if (columnIndex === 2) {{ // File Size
+                    key = parseInt(text.replace(/[^0-9]/g, '')) || 0;
+                }} else if (columnIndex === 3) {{ // Delete Time
+                    key = new Date(text).getTime();
+                }} else {{ // String values
+                    key = text.toLowerCase();
+                }}
+                entry.keys[columnIndex] = key;
+            }}
+            return key;
+        }}
+
         function sortTable(columnIndex) {{
             const table = document.getElementById('dataTable');
             const tbody = table.querySelector('tbody');
-            const rows = Array.from(tbody.querySelectorAll('tr'));
             const header = table.querySelector('thead tr').children[columnIndex];
             
             // Clear previous sort indicators
@@ -804,46 +902,54 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
             header.classList.add(direction === 'asc' ? 'sort-asc' : 'sort-desc');
             currentSort = {{ column: columnIndex, direction: direction }};
             
-            // Sort rows
-            rows.sort((a, b) => {{
-                let aValue = a.children[columnIndex].textContent.trim();
-                let bValue = b.children[columnIndex].textContent.trim();
+            // Sort the cached rows on precomputed keys (no DOM reads inside the comparator)
+            rowCache.sort((a, b) => {{
+                const aValue = sortKey(a, columnIndex);
+                const bValue = sortKey(b, columnIndex);
                 
-                // Handle different data types
-                if (columnIndex === 2) {{ // File Size
-                    aValue = parseInt(aValue.replace(/[^0-9]/g, '')) || 0;
-                    bValue = parseInt(bValue.replace(/[^0-9]/g, '')) || 0;
-                    return direction === 'asc' ? aValue - bValue : bValue - aValue;
-                }} else if (columnIndex === 3) {{ // Delete Time
-                    aValue = new Date(aValue);
-                    bValue = new Date(bValue);
+                if (columnIndex === 2 || columnIndex === 3) {{ // File Size, Delete Time
                     return direction === 'asc' ? aValue - bValue : bValue - aValue;
-                }} else {{ // String values
-                    aValue = aValue.toLowerCase();
-                    bValue = bValue.toLowerCase();
-                    if (aValue < bValue) return direction === 'asc' ? -1 : 1;
-                    if (aValue > bValue) return direction === 'asc' ? 1 : -1;
-                    return 0;
                 }}
+                if (aValue < bValue) return direction === 'asc' ? -1 : 1;
+                if (aValue > bValue) return direction === 'asc' ? 1 : -1;
+                return 0;
             }});
             
-            // Reorder rows
-            rows.forEach(row => tbody.appendChild(row));
+            // Reorder rows with a single insertion into the table
+            const fragment = document.createDocumentFragment();
+            rowCache.forEach(entry => fragment.appendChild(entry.row));
+            tbody.appendChild(fragment);
+        }}
+
+        function visibleRows() {{
+            return rowCache.filter(entry => !entry.hidden).map(entry => entry.row);
+        }}
+
+        function scheduleFilter() {{
+            clearTimeout(filterTimer);
+            filterTimer = setTimeout(filterTable, 150);
         }}
 
         function filterTable() {{
-            const searchTerm = document.getElementById('searchBox').value.toLowerCase();
-            const tbody = document.querySelector('#dataTable tbody');
-            const rows = tbody.querySelectorAll('tr');
+            let searchTerm = document.getElementById('searchBox').value.toLowerCase();
+            // Queries shorter than the minimum match nearly every row, so they show
+            // the whole table (as an empty query does) instead of filtering
+            if (searchTerm.length < SEARCH_MIN_LENGTH) {{
+                searchTerm = '';
+            }}
             
+            // Match against the cached text first, then apply all visibility changes in one pass,
+            // touching only rows whose state changed so each keystroke restyles as few rows as possible
+            const matches = rowCache.map(entry => entry.text.includes(searchTerm));
             filteredData = [];
-            rows.forEach((row, index) => {{
-                const text = row.textContent.toLowerCase();
-                if (text.includes(searchTerm)) {{
-                    row.style.display = '';
-                    filteredData.push(row.innerHTML);
-                }} else {{
-                    row.style.display = 'none';
+            rowCache.forEach((entry, index) => {{
+                const hidden = !matches[index];
+                if (entry.hidden !== hidden) {{
+                    entry.row.classList.toggle('filter-hidden', hidden);
+                    entry.hidden = hidden;
+                }}
+                if (!hidden) {{
+                    filteredData.push(entry.row);
                 }}
             }});
             
@@ -852,19 +958,17 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
         }}
 
         function updateResultCount() {{
-            const visibleRows = document.querySelectorAll('#dataTable tbody tr:not([style*="display: none"])');
-            const totalRows = document.querySelectorAll('#dataTable tbody tr').length;
-            
             // You could add a result counter here if desired
-            console.log(`Showing ${{visibleRows.length}} of ${{totalRows}} files`);
+            console.log(`Showing ${{filteredData.length}} of ${{rowCache.length}} files`);
         }}
 
         function exportToCSV() {{
             const table = document.getElementById('dataTable');
-            const rows = Array.from(table.querySelectorAll('tr:not([style*="display: none"])'));
+            const rows = [table.querySelector('thead tr')].concat(visibleRows());
             
-            let csv = [];
-            rows.forEach(row => {{
+            // One Blob part per line; the browser assembles them without a giant joined string
+            const parts = [];
+            rows.forEach((row, index) => {{
                 const cells = Array.from(row.querySelectorAll('th, td'));
                 const rowData = cells.map(cell => {{
                     let text = cell.textContent.trim();
@@ -874,35 +978,37 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
                     }}
                     return text;
                 }});
-                csv.push(rowData.join(','));
+                parts.push(index ? '\\n' + rowData.join(',') : rowData.join(','));
             }});
             
-            const csvContent = csv.join('\\n');
-            downloadFile(csvContent, 'recycle_bin_analysis.csv', 'text/csv');
+            downloadFile(parts, 'recycle_bin_analysis.csv', 'text/csv');
         }}
 
         function exportToJSON() {{
             const table = document.getElementById('dataTable');
-            const headers = Array.from(table.querySelectorAll('th')).map(th => th.textContent.trim());
-            const rows = Array.from(table.querySelectorAll('tbody tr:not([style*="display: none"])'));
+            // JSON keys are derived from the headers once, not once per row
+            const keys = Array.from(table.querySelectorAll('th')).map(th => th.textContent.trim().toLowerCase().replace(/\\s+/g, '_'));
+            const rows = visibleRows();
             
-            const jsonData = {{
-                exportInfo: {{
-                    timestamp: new Date().toISOString(),
-                    totalFiles: rows.length,
-                    exportType: 'filtered_data'
-                }},
-                files: rows.map(row => {{
-                    const cells = Array.from(row.querySelectorAll('td'));
-                    const fileData = {{}};
-                    headers.forEach((header, index) => {{
-                        fileData[header.toLowerCase().replace(/\\s+/g, '_')] = cells[index] ? cells[index].textContent.trim() : '';
-                    }});
-                    return fileData;
-                }})
+            const exportInfo = {{
+                timestamp: new Date().toISOString(),
+                totalFiles: rows.length,
+                exportType: 'filtered_data'
             }};
             
-            downloadFile(JSON.stringify(jsonData, null, 2), 'recycle_bin_analysis.json', 'application/json');
+            // Serialize record by record into Blob parts instead of one stringified document
+            const parts = ['{{\\n  "exportInfo": ', JSON.stringify(exportInfo), ',\\n  "files": ['];
+            rows.forEach((row, rowIndex) => {{
+                const cells = Array.from(row.querySelectorAll('td'));
+                const fileData = {{}};
+                for (let index = 0; index < keys.length; index++) {{
+                    fileData[keys[index]] = cells[index] ? cells[index].textContent.trim() : '';
+                }}
+                parts.push(rowIndex ? ',\\n    ' : '\\n    ', JSON.stringify(fileData));
+            }});
+            parts.push('\\n  ]\\n}}\\n');
+            
+            downloadFile(parts, 'recycle_bin_analysis.json', 'application/json');
         }}
 
         function printReport() {{
@@ -922,6 +1028,7 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
                         table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
                         th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
                         th {{ background-color: #f2f2f2; }}
+                        .filter-hidden {{ display: none; }}
                         @media print {{ 
                             body {{ margin: 0; }}
                             .export-buttons {{ display: none; }}
@@ -938,8 +1045,8 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
             printWindow.print();
         }}
 
-        function downloadFile(content, filename, mimeType) {{
-            const blob = new Blob([content], {{ type: mimeType }});
+        function downloadFile(parts, filename, mimeType) {{
+            const blob = new Blob(parts, {{ type: mimeType }});
             const url = URL.createObjectURL(blob);
             const link = document.createElement('a');
             link.href = url;
@@ -950,11 +1057,13 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
             URL.revokeObjectURL(url);
         }}
 
+        const FILE_SIZE_UNITS = ['B', 'KB', 'MB', 'GB', 'TB'];
+
         function formatFileSize(bytes) {{
-            const sizes = ['B', 'KB', 'MB', 'GB', 'TB'];
             if (bytes === 0) return '0 B';
-            const i = Math.floor(Math.log(bytes) / Math.log(1024));
-            return Math.round(bytes / Math.pow(1024, i) * 100) / 100 + ' ' + sizes[i];
+            // 1024 = 2^10, so one log2 call gives the unit index
+            const i = Math.floor(Math.log2(bytes) / 10);
+            return Math.round(bytes / Math.pow(1024, i) * 100) / 100 + ' ' + FILE_SIZE_UNITS[i];
         }}
 
         // Add smooth scrolling for better UX
@@ -992,80 +1101,156 @@ def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analy
 </body>
 </html>"""
 
+def _compile_template(template: str) -> tuple:
+    """Split a str.format template into (literal text, field name) pairs once."""
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+# Parsed once at import so each export only concatenates fragments and values
+_HTML_TEMPLATE_PARTS = _compile_template(_HTML_TEMPLATE)
+
+def _to_js(value) -> str:
+    """Serialize a value as a JavaScript literal that is safe inside a <script> block."""
+    return json.dumps(value).replace('</', '<\\/')
+
+# Slate palette for the top-10 extension chart, serialized once at import
+_CHART_COLORS = (
+    '#475569', '#64748b', '#94a3b8', '#cbd5e1', '#e2e8f0',
+    '#334155', '#1e293b', '#f1f5f9', '#94a3b8', '#64748b'
+)
+_CHART_COLORS_JS = _to_js(_CHART_COLORS)
+
+def _write_template(out, parts: tuple, values: Dict):
+    """Write a compiled template to a file; values given as iterators are streamed chunk by chunk."""
+    write = out.write
+    for literal, field in parts:
+        write(literal)
+        if field is not None:
+            value = values[field]
+            if isinstance(value, Iterator):
+                for chunk in value:
+                    write(chunk)
+            else:
+                write(str(value))
+
+# One HTML report table row (file size is formatted by the template itself);
+# the bound format method is looked up once
+_format_html_row = """
+                <tr>
+                    <td>{}</td>
+                    <td class="path-cell">{}</td>
+                    <td class="file-size">{:,} bytes</td>
+                    <td>{}</td>
+                    <td class="path-cell">{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td class="can-read {}">{}</td>
+                </tr>""".format
+
+# Cell class and label for the "Can Read" column, indexed by the boolean
+_CAN_READ_CLASSES = ('false', 'true')
+_CAN_READ_LABELS = ('No', 'Yes')
+
+def _html_table_rows(files_info: List[Dict]) -> Iterator[str]:
+    """Yield the HTML report table rows one at a time."""
+    for file_info in files_info:
+        # Pull every column out in one call, with defaults for missing fields
+        (original_name, original_path, file_size, delete_time, sid_folder,
+         username, recycled_name, can_read) = _export_fields(file_info)
+        
+        # Format delete time with proper formatting
+        delete_time = _format_delete_time(delete_time)
+        
+        # Format can_read_content
+        can_read_class = _CAN_READ_CLASSES[bool(can_read)]
+        can_read_text = _CAN_READ_LABELS[bool(can_read)]
+        
+        # Extract username only from format like "username (SID)"
+        user_part, paren, _ = username.partition('(')
+        if paren and ')' in username:
+            username = user_part.strip()
+        
+        # Names and paths come from the deleted files themselves, so escape them
+        yield _format_html_row(
+            html.escape(original_name), html.escape(str(original_path)), file_size, delete_time,
+            html.escape(sid_folder), html.escape(username), html.escape(recycled_name),
+            can_read_class, can_read_text
+        )
+    
+    if not files_info:
+        yield '<tr><td colspan="8" class="no-data">No deleted files found in the Recycle Bin.</td></tr>'
+
+def export_to_html(files_info: List[Dict], output_file: str = "recycle_bin_analysis.html"):
+    """Export the analysis results to an HTML file with sortable table."""
+    try:
+        # Calculate file extension, size and user statistics in a single pass
+        extension_stats = Counter()
+        total_files = len(files_info)
+        total_size = 0
+        users = set()
+        
+        for file_info in files_info:
+            total_size += file_info.get('file_size', 0)
+            users.add(file_info.get('sid_display', ''))
+            original_name = file_info.get('original_name', '')
+            if original_name:
+                # Extract file extension (rpartition avoids building a list per name)
+                _, dot, extension = original_name.rpartition('.')
+                if dot:
+                    if extension:
+                        extension_stats[extension.lower()] += 1
+                else:
+                    # Files without extension
+                    extension_stats['No Extension'] += 1
+            else:
+                # Unknown files
+                extension_stats['Unknown'] += 1
+        
+        # Top 10 extensions by count (descending)
+        top_extensions = extension_stats.most_common(10)
+        
+        # Prepare chart data
+        chart_labels = [ext for ext, count in top_extensions]
+        chart_data = [count for ext, count in top_extensions]
+
         # Calculate statistics
-        total_size = sum(file_info.get('file_size', 0) for file_info in files_info)
-        unique_users = len(set(file_info.get('sid_display', '') for file_info in files_info))
+        unique_users = len(users)
         file_types_count = len(extension_stats)
 
         # Generate extension list for display
-        extension_list_html = ""
+        extension_items = []
         for ext, count in top_extensions:
             percentage = (count / total_files * 100) if total_files > 0 else 0
-            extension_list_html += f'<div class="extension-item"><span class="extension-name">{ext}</span><span class="extension-count">{count} ({percentage:.1f}%)</span></div>'
-
-        # Generate table rows
-        table_rows = ""
-        for file_info in files_info:
-            # Format file size
-            file_size = file_info.get('file_size', 0)
-            formatted_size = f"{file_size:,} bytes"
-            
-            # Format delete time with proper formatting
-            delete_time_obj = file_info.get('delete_time', '')
-            if delete_time_obj and hasattr(delete_time_obj, 'strftime'):
-                delete_time = delete_time_obj.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                delete_time = str(delete_time_obj) if delete_time_obj else ''
-            
-            # Format can_read_content
-            can_read = file_info.get('can_read_content', False)
-            can_read_class = "true" if can_read else "false"
-            can_read_text = "Yes" if can_read else "No"
-            
-            # Extract username only (remove SID if present)
-            username = file_info.get('sid_display', '')
-            if username and '(' in username and ')' in username:
-                # Extract username from format like "username (SID)"
-                username = username.split('(')[0].strip()
-            
-            row = f"""
-                <tr>
-                    <td>{file_info.get('original_name', '')}</td>
-                    <td class="path-cell">{file_info.get('original_path', '')}</td>
-                    <td class="file-size">{formatted_size}</td>
-                    <td>{delete_time}</td>
-                    <td class="path-cell">{file_info.get('sid_folder', '')}</td>
-                    <td>{username}</td>
-                    <td>{file_info.get('recycled_name', '')}</td>
-                    <td class="can-read {can_read_class}">{can_read_text}</td>
-                </tr>"""
-            table_rows += row
-
-        if not table_rows:
-            table_rows = '<tr><td colspan="8" class="no-data">No deleted files found in the Recycle Bin.</td></tr>'
+            extension_items.append(f'<div class="extension-item"><span class="extension-name">{html.escape(ext)}</span><span class="extension-count">{count} ({percentage:.1f}%)</span></div>')
+        extension_list_html = "".join(extension_items)
 
         # Format total size
         formatted_total_size = f"{total_size:,} bytes ({total_size / (1024*1024):.2f} MB)"
 
-        # Generate HTML content
-        html_content = html_template.format(
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            total_files=len(files_info),
-            total_size=formatted_total_size,
-            unique_users=unique_users,
-            file_types_count=file_types_count,
-            chart_labels=chart_labels,
-            chart_data=chart_data,
-            chart_colors=chart_colors,
-            extension_list=extension_list_html,
-            table_rows=table_rows
-        )
-
-        # Write to HTML file
-        with open(output_file, 'w', encoding='utf-8') as htmlfile:
-            htmlfile.write(html_content)
+        # Write the report straight to the file; the table rows are generated
+        # while writing rather than held in one large string
+        # newline='\n' writes the text as-is, skipping the per-character newline
+        # translation text mode does on Windows (browsers accept plain LF)
+        with _atomic_open(output_file, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) as htmlfile:
+            _write_template(htmlfile, _HTML_TEMPLATE_PARTS, dict(
+                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                total_files=len(files_info),
+                total_size=formatted_total_size,
+                unique_users=unique_users,
+                file_types_count=file_types_count,
+                chart_labels=_to_js(chart_labels),
+                chart_data=_to_js(chart_data),
+                chart_colors=_CHART_COLORS_JS,
+                extension_list=extension_list_html,
+                table_rows=_html_table_rows(files_info)
+            ))
 
         print(f"\nAnalysis exported to HTML: {output_file}")
 
     except Exception as e:
-        print(f"Error exporting to HTML: {e}") 
\ No newline at end of file
+        print(f"Error exporting to HTML: {e}") 
+
+def export_all(files_info: List[Dict], base: str = "recycle_bin_analysis"):
+    """Export the analysis results to CSV, JSON and HTML files named after base."""
+    export_to_csv(files_info, f"{base}.csv")
+    export_to_json(files_info, f"{base}.json")
+    export_to_html(files_info, f"{base}.html")
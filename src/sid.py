@@ -1,4 +1,11 @@
-from typing import List, Optional
+import atexit
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 # Windows API imports
 try:
@@ -13,9 +20,75 @@ try:
 except ImportError:
     WINDOWS_API_AVAILABLE = False
 
+# API calls made once per SID, bound here so those calls skip the module attribute lookup
+if WINDOWS_API_AVAILABLE:
+    _ConvertStringSidToSid = win32security.ConvertStringSidToSid
+    _ConvertSidToStringSid = win32security.ConvertSidToStringSid
+    _LookupAccountSid = win32security.LookupAccountSid
 
+# Account type descriptions by LookupAccountSid SID type
+if WINDOWS_API_AVAILABLE:
+    _ACCOUNT_TYPES = {
+        win32security.SidTypeUser: "User",
+        win32security.SidTypeGroup: "Group",
+        win32security.SidTypeDomain: "Domain",
+        win32security.SidTypeAlias: "Alias",
+        win32security.SidTypeWellKnownGroup: "Well Known Group",
+        win32security.SidTypeDeletedAccount: "Deleted Account",
+        win32security.SidTypeInvalid: "Invalid",
+        win32security.SidTypeUnknown: "Unknown",
+        win32security.SidTypeComputer: "Computer"
+    }
+else:
+    _ACCOUNT_TYPES = {}
+
+# Identifier authority (S-1-5) and first sub-authority (21) of account SIDs
+_NT_AUTHORITY = (0, 0, 0, 0, 0, 5)
+_SECURITY_NT_NON_UNIQUE = 21
+
+# Descriptions for common well-known SIDs
+_COMMON_SIDS = {
+    'S-1-5-18': 'Local System',
+    'S-1-5-19': 'NT Authority (Local Service)',
+    'S-1-5-20': 'NT Authority (Network Service)',
+    'S-1-5-32-544': 'Administrators',
+    'S-1-5-32-545': 'Users',
+    'S-1-5-32-546': 'Guests',
+    'S-1-5-32-547': 'Power Users',
+    'S-1-5-32-548': 'Account Operators',
+    'S-1-5-32-549': 'Server Operators',
+    'S-1-5-32-550': 'Print Operators',
+    'S-1-5-32-551': 'Backup Operators',
+    'S-1-5-32-552': 'Replicators'
+}
+
+
+# Seconds an enumeration of local user SIDs is reused before querying again
+_USER_SIDS_TTL = 60.0
+
+# Users requested per NetQueryDisplayInformation page
+_DISPLAY_PAGE_SIZE = 100
+
+def _ttl_cache(ttl: float):
+    """Cache the result of a function without arguments for ttl seconds."""
+    def decorator(func):
+        entry = []  # [(value, expiry time.monotonic())] once computed
+        
+        @wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if entry and now < entry[0][1]:
+                return entry[0][0]
+            value = func()
+            entry[:] = [(value, now + ttl)]
+            return value
+        
+        return wrapper
+    return decorator
+
+@lru_cache(maxsize=1)
 def get_current_user_sid() -> Optional[str]:
-    """Get the current user's SID using Windows API."""
+    """Get the current user's SID using Windows API (looked up once per process)."""
     if not WINDOWS_API_AVAILABLE:
         print("Error: Windows API (pywin32) is not available. Cannot get current user SID.")
         return None
@@ -69,35 +142,223 @@ def _get_sid_for_username(username: str) -> Optional[str]:
         print(f"Warning: Could not get SID for username '{username}': {e}")
     return None
 
-def get_all_user_sids() -> List[str]:
-    """Get all local user SIDs using Windows API."""
+def iter_all_user_sids() -> Iterator[str]:
+    """Yield all local user SIDs using Windows API."""
     if not WINDOWS_API_AVAILABLE:
         print("Error: Windows API (pywin32) is not available. Cannot get user SIDs.")
-        return []
+        return
+    
+    # Enumeration is reused for _USER_SIDS_TTL seconds (accounts can be added or
+    # removed, but not between scans moments apart)
+    yield from _enumerate_user_sids()
+
+def get_all_user_sids() -> List[str]:
+    """Get all local user SIDs using Windows API."""
+    return list(iter_all_user_sids())
+
+def _is_account_sid(sid_object) -> bool:
+    """Check whether a PySID is a domain or local account SID (S-1-5-21-...)."""
+    # Reads the binary SID directly instead of formatting and prefix-matching it
+    return (sid_object.GetSidIdentifierAuthority() == _NT_AUTHORITY
+            and sid_object.GetSubAuthorityCount() > 0
+            and sid_object.GetSubAuthority(0) == _SECURITY_NT_NON_UNIQUE)
+
+def _fetch_user_sid(username: str) -> Optional[str]:
+    """Get the SID of a local user account, or None if it is not a user SID or can't be queried."""
+    try:
+        # Get user info including SID
+        user_info = win32net.NetUserGetInfo("", username, 4)
+        if user_info and 'user_sid' in user_info:
+            # Only format SIDs that will be kept as strings
+            sid_object = user_info['user_sid']
+            if _is_account_sid(sid_object):
+                return _ConvertSidToStringSid(sid_object)
+    except Exception as e:
+        # Skip users that can't be queried
+        print(f"Warning: Could not get SID for user '{username}': {e}")
+    return None
+
+@lru_cache(maxsize=1)
+def _get_account_domain_sid() -> str:
+    """Get the SID of the machine's account domain (the prefix of local user SIDs)."""
+    policy = win32security.LsaOpenPolicy(None, win32security.POLICY_VIEW_LOCAL_INFORMATION)
+    try:
+        _, domain_sid = win32security.LsaQueryInformationPolicy(
+            policy, win32security.PolicyAccountDomainInformation
+        )
+    finally:
+        win32security.LsaClose(policy)
+    return win32security.ConvertSidToStringSid(domain_sid)
+
+def _query_display_user_sids() -> Optional[Tuple[str, ...]]:
+    """Enumerate local user SIDs from display information, or None if that query is not available."""
+    # Not every pywin32 build exposes NetQueryDisplayInformation
+    if not hasattr(win32net, 'NetQueryDisplayInformation'):
+        return None
+    
+    # Each entry carries the user's RID, and a local account's SID is the account
+    # domain SID plus that RID, so whole pages of users need no further RPCs
+    domain_sid = _get_account_domain_sid()
+    if not domain_sid.startswith('S-1-5-21-'):
+        return None
     
     sids = []
+    index = 0
+    while True:
+        entries = win32net.NetQueryDisplayInformation("", 1, index, _DISPLAY_PAGE_SIZE, win32netcon.MAX_PREFERRED_LENGTH)
+        if not entries:
+            break
+        for entry in entries:
+            if entry['flags'] & win32netcon.UF_NORMAL_ACCOUNT:
+                sids.append(f"{domain_sid}-{entry['user_id']}")
+        index = entries[-1]['next_index']
+    return tuple(sids)
+
+@_ttl_cache(_USER_SIDS_TTL)
+def _enumerate_user_sids() -> Tuple[str, ...]:
+    """Enumerate local user SIDs via the Windows API."""
+    # The display query is only a fast path: when it is unavailable or fails, the
+    # per-user queries below list the same accounts and report their own errors
+    try:
+        sids = _query_display_user_sids()
+    except Exception:
+        sids = None
+    if sids is not None:
+        return sids
+    
     try:
         # Get all local users
         users = win32net.NetUserEnum("", 0, win32netcon.FILTER_NORMAL_ACCOUNT, 0)[0]
-        
-        for user in users:
-            try:
-                # Get user info including SID
-                user_info = win32net.NetUserGetInfo("", user['name'], 4)
-                if user_info and 'user_sid' in user_info:
-                    sid_string = win32security.ConvertSidToStringSid(user_info['user_sid'])
-                    if sid_string.startswith('S-1-5-21-'):
-                        sids.append(sid_string)
-            except Exception as e:
-                print(f"Warning: Could not get SID for user '{user['name']}': {e}")
-                # Skip users that can't be queried
-                continue
-                
     except Exception as e:
         print(f"Error: Could not get user SIDs via API: {e}")
-        return []
+        return ()
+    
+    if not users:
+        return ()
     
-    return sids
+    # Each NetUserGetInfo is a blocking RPC that releases the GIL, so query the
+    # users concurrently; map() keeps the enumeration order
+    with ThreadPoolExecutor(max_workers=min(32, len(users))) as executor:
+        sids = executor.map(_fetch_user_sid, (user['name'] for user in users))
+        return tuple(sid_string for sid_string in sids if sid_string)
+
+# SIDs that recently failed to resolve (deleted accounts, orphaned profiles):
+# SID -> (time.monotonic() of the failure, exception). Entries expire after
+# _UNRESOLVED_SID_TTL seconds so accounts that come back are picked up again
+_UNRESOLVED_SIDS: Dict[str, Tuple[float, Exception]] = {}
+_UNRESOLVED_SID_TTL = 300.0
+_UNRESOLVED_SIDS_MAX = 8192
+
+# Resolved SIDs are also kept on disk so later runs can skip the LSA lookups:
+# SID -> (name, domain, account type, time.time() of the lookup)
+_SID_CACHE_FILE = (Path(os.environ['LOCALAPPDATA']) / "windows-recycle-bin-analyzer" / "sid_cache.json"
+                   if os.environ.get('LOCALAPPDATA') else None)
+_SID_CACHE_TTL = 24 * 60 * 60
+_persistent_sids: Dict[str, Tuple[str, str, int, float]] = {}
+_persistent_sids_dirty = False
+
+def _load_persistent_sid_cache() -> Dict[str, Tuple[str, str, int, float]]:
+    """Read the on-disk SID cache, keeping only entries younger than _SID_CACHE_TTL."""
+    try:
+        with open(_SID_CACHE_FILE, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        now = time.time()
+        return {
+            sid: (entry['name'], entry['domain'], entry['type'], entry['time'])
+            for sid, entry in entries.items()
+            if now - entry['time'] < _SID_CACHE_TTL
+        }
+    except Exception:
+        # Missing or unreadable cache: start empty and rebuild it
+        return {}
+
+def _save_persistent_sid_cache():
+    """Write the SID cache back to disk if lookups were added during this run."""
+    if not _persistent_sids_dirty:
+        return
+    now = time.time()
+    entries = {
+        sid: {'name': name, 'domain': domain, 'type': account_type, 'time': looked_up}
+        for sid, (name, domain, account_type, looked_up) in list(_persistent_sids.items())
+        if now - looked_up < _SID_CACHE_TTL
+    }
+    temp_file = _SID_CACHE_FILE.with_name(_SID_CACHE_FILE.name + '.tmp')
+    try:
+        _SID_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(temp_file, _SID_CACHE_FILE)
+    except Exception as e:
+        print(f"Warning: Could not save SID cache to {_SID_CACHE_FILE}: {e}")
+
+if WINDOWS_API_AVAILABLE and _SID_CACHE_FILE is not None:
+    _persistent_sids = _load_persistent_sid_cache()
+    atexit.register(_save_persistent_sid_cache)
+
+@lru_cache(maxsize=4096)
+def _lookup_account_sid(sid: str) -> Tuple[str, str, int]:
+    """Look up the (name, domain, account type) of a SID string, once per SID."""
+    # LookupAccountSid is an RPC to LSA and the same few SIDs repeat across a scan.
+    # Failures raise, so lru_cache never stores them; a recent failure is replayed
+    # from _UNRESOLVED_SIDS instead of paying for the RPC again
+    now = time.monotonic()
+    failure = _UNRESOLVED_SIDS.get(sid)
+    if failure is not None and now - failure[0] < _UNRESOLVED_SID_TTL:
+        raise failure[1].with_traceback(None)
+    
+    # Then the lookups saved by earlier runs
+    saved = _persistent_sids.get(sid)
+    if saved is not None and time.time() - saved[3] < _SID_CACHE_TTL:
+        return saved[:3]
+    
+    try:
+        name, domain, account_type = _LookupAccountSid("", _ConvertStringSidToSid(sid))
+    except Exception as e:
+        if len(_UNRESOLVED_SIDS) >= _UNRESOLVED_SIDS_MAX:
+            _prune_unresolved_sids(now)
+        _UNRESOLVED_SIDS[sid] = (now, e)
+        raise
+    
+    global _persistent_sids_dirty
+    _persistent_sids[sid] = (name, domain, account_type, time.time())
+    _persistent_sids_dirty = True
+    return name, domain, account_type
+
+def _prune_unresolved_sids(now: float):
+    """Drop expired failures, or all of them if none have expired yet."""
+    # Iterate over a snapshot: resolve_sids_bulk workers may add failures meanwhile
+    expired = [sid for sid, (failed_at, _) in list(_UNRESOLVED_SIDS.items()) if now - failed_at >= _UNRESOLVED_SID_TTL]
+    if not expired:
+        _UNRESOLVED_SIDS.clear()
+    for sid in expired:
+        _UNRESOLVED_SIDS.pop(sid, None)
+
+def _try_lookup_account_sid(sid: str) -> Optional[Tuple[str, str, int]]:
+    """Look up a SID, returning None instead of raising when it cannot be resolved."""
+    try:
+        return _lookup_account_sid(sid)
+    except Exception:
+        return None
+
+def resolve_sids_bulk(sids: Iterable[str]) -> Dict[str, Tuple[str, str, int]]:
+    """Resolve many SIDs to (name, domain, account type), skipping any that cannot be resolved."""
+    if not WINDOWS_API_AVAILABLE:
+        return {}
+    
+    # Each lookup is a blocking LSA RPC that releases the GIL, so the distinct
+    # SIDs are looked up concurrently; results land in the per-SID cache
+    unique_sids = list(dict.fromkeys(sids))
+    if not unique_sids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(16, len(unique_sids))) as executor:
+        results = executor.map(_try_lookup_account_sid, unique_sids)
+        return {sid: result for sid, result in zip(unique_sids, results) if result is not None}
+
+def _format_account(name: str, domain: str) -> str:
+    """Format an account name as DOMAIN\\name, or just name for the local ('.') or empty domain."""
+    if not domain or domain == ".":
+        return name
+    return domain + "\\" + name
 
 def resolve_sid_to_username(sid: str) -> Optional[str]:
     """Resolve a SID to a username using Windows API."""
@@ -106,83 +367,42 @@ def resolve_sid_to_username(sid: str) -> Optional[str]:
         return f"Unknown User ({sid})"
     
     try:
-        # Convert string SID to SID object
-        sid_object = win32security.ConvertStringSidToSid(sid)
-        
         # Get account name and domain
-        name, domain, account_type = win32security.LookupAccountSid("", sid_object)
+        name, domain, account_type = _lookup_account_sid(sid)
         
         # Return username (with domain if available)
-        if domain and domain != ".":
-            return f"{domain}\\{name}"
-        else:
-            return name
+        return _format_account(name, domain)
             
     except Exception as e:
         print(f"Warning: Could not resolve SID {sid} to username via API: {e}")
         return f"Unknown User ({sid})"
 
-def get_sid_info(sid: str) -> dict:
+class SidInfo(NamedTuple):
+    """Information about a SID; use _asdict() where a dict is needed."""
+    sid: str
+    username: Optional[str] = None
+    account_type: Optional[str] = None
+    description: Optional[str] = None
+
+def get_sid_info(sid: str) -> SidInfo:
     """Get comprehensive information about a SID including username and account type."""
-    info = {
-        'sid': sid,
-        'username': None,
-        'account_type': None,
-        'description': None
-    }
-    
     if not WINDOWS_API_AVAILABLE:
         print(f"Error: Windows API (pywin32) is not available. Cannot get full SID info for {sid}.")
-        info['username'] = f"Unknown User ({sid})"
-        return info
+        return SidInfo(sid, f"Unknown User ({sid})")
     
     try:
-        # Convert string SID to SID object
-        sid_object = win32security.ConvertStringSidToSid(sid)
-        
         # Get account name, domain, and account type
-        name, domain, account_type = win32security.LookupAccountSid("", sid_object)
-        
-        # Set username
-        if domain and domain != ".":
-            info['username'] = f"{domain}\\{name}"
-        else:
-            info['username'] = name
-        
-        # Set account type description
-        account_types = {
-            win32security.SidTypeUser: "User",
-            win32security.SidTypeGroup: "Group", 
-            win32security.SidTypeDomain: "Domain",
-            win32security.SidTypeAlias: "Alias",
-            win32security.SidTypeWellKnownGroup: "Well Known Group",
-            win32security.SidTypeDeletedAccount: "Deleted Account",
-            win32security.SidTypeInvalid: "Invalid",
-            win32security.SidTypeUnknown: "Unknown",
-            win32security.SidTypeComputer: "Computer"
-        }
-        info['account_type'] = account_types.get(account_type, "Unknown")
-        
-        # Add description for common SIDs
-        common_sids = {
-            'S-1-5-18': 'Local System',
-            'S-1-5-19': 'NT Authority (Local Service)',
-            'S-1-5-20': 'NT Authority (Network Service)',
-            'S-1-5-32-544': 'Administrators',
-            'S-1-5-32-545': 'Users',
-            'S-1-5-32-546': 'Guests',
-            'S-1-5-32-547': 'Power Users',
-            'S-1-5-32-548': 'Account Operators',
-            'S-1-5-32-549': 'Server Operators',
-            'S-1-5-32-550': 'Print Operators',
-            'S-1-5-32-551': 'Backup Operators',
-            'S-1-5-32-552': 'Replicators'
-        }
-        info['description'] = common_sids.get(sid, None)
-        
+        name, domain, account_type = _lookup_account_sid(sid)
     except Exception as e:
         # Fallback to basic method
-        info['username'] = f"Unknown User ({sid})"
         print(f"Warning: Could not get full SID info for {sid}: {e}")
+        return SidInfo(sid, f"Unknown User ({sid})")
     
-    return info 
\ No newline at end of file
+    return SidInfo(
+        sid,
+        _format_account(name, domain),
+        # Account type description
+        _ACCOUNT_TYPES.get(account_type, "Unknown"),
+        # Description for common SIDs
+        _COMMON_SIDS.get(sid, None)
+    )